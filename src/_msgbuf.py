@@ -0,0 +1,16 @@
+"""
+Thread-local scratch buffers for outbound message serialization.
+"""
+import threading
+
+BUFFER_SIZE = 4096
+
+_local = threading.local()
+
+
+def get_buffer():
+    """Return the calling thread's reusable send buffer."""
+    buf = getattr(_local, "buf", None)
+    if buf is None:
+        buf = _local.buf = bytearray(BUFFER_SIZE)
+    return buf
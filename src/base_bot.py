@@ -1,6 +1,7 @@
 """
 Base class for trading bots.
 """
+import logging
 import signal
 import threading
 import time
@@ -12,6 +13,8 @@ from .enums import Side
 from .exchange_client import ExchangeClient
 from .position import Portfolio
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class BotConfig:
@@ -21,20 +24,26 @@ class BotConfig:
     host: str = "localhost"
     send_port: int = 5555
     recv_port: int = 5556
-    tick_interval: float = 1.0
+    tick_interval: float = 1.0      # Longest wait between ticks when no prices arrive
+    min_tick_interval: float = 0.001  # Shortest gap between ticks, to coalesce bursts of updates
+    wire_format: str = "json"
     symbols: List[str] = field(default_factory=list)
 
 
 class BaseBot(ABC):
     """Base class for trading bots."""
     
-    def __init__(self, config: BotConfig):
+    def __init__(self, config: BotConfig, context=None):
         self.config = config
-        self.client = ExchangeClient(config.client_id, config.host, config.send_port, config.recv_port)
+        # Pass a shared zmq.Context to run several bots on one I/O thread
+        self.client = ExchangeClient(config.client_id, config.host, config.send_port, config.recv_port,
+                                     wire_format=config.wire_format, context=context)
         self.portfolio = Portfolio()
         self._last_prices: Dict[str, float] = {}
         self._running = False
         self._bot_thread: Optional[threading.Thread] = None
+        self._tick_cv = threading.Condition()
+        self._tick_pending = False  # Set by price updates, cleared when the bot loop wakes
         self.client.on_ack(self._internal_on_ack)
         self.client.on_reject(self._internal_on_reject)
         self.client.on_fill(self._internal_on_fill)
@@ -60,19 +69,55 @@ class BaseBot(ABC):
         if not self._running:
             return
         self._running = False
+        with self._tick_cv:
+            self._tick_cv.notify_all()
         self.on_stop()
         if self._bot_thread and self._bot_thread.is_alive():
             self._bot_thread.join(timeout=2.0)
         self.client.disconnect()
     
     def _run_loop(self):
+        # The handler sits outside the tick loop; an error restarts it after a wait
         while self._running:
             try:
-                self.on_tick(self._get_prices())
-                time.sleep(self.config.tick_interval)
+                self._tick_loop()
             except Exception as e:
                 if self._running:
-                    print(f"[BOT] Error: {e}")
+                    logger.warning("Bot error: %s", e)
+                    self._backoff()
+    
+    def _tick_loop(self):
+        client = self.client
+        while self._running:
+            started = time.monotonic()
+            client.begin_batch()
+            try:
+                self.on_tick(self._get_prices())
+            finally:
+                client.flush_batch()  # Orders queued by a tick that raised still go out
+            self._wait_for_tick(started)
+    
+    def _wait_for_tick(self, started):
+        """Block until a price update arrives or tick_interval passes."""
+        with self._tick_cv:
+            self._tick_cv.wait_for(self._tick_ready, timeout=self.config.tick_interval)
+            self._tick_pending = False
+        remaining = started + self.config.min_tick_interval - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+    
+    def _backoff(self):
+        """Wait a full tick_interval after an error, ignoring price updates; stop() cuts it short."""
+        with self._tick_cv:
+            self._tick_cv.wait_for(lambda: not self._running, timeout=self.config.tick_interval)
+    
+    def _tick_ready(self):
+        return self._tick_pending or not self._running
+    
+    def _notify_tick(self):
+        with self._tick_cv:
+            self._tick_pending = True
+            self._tick_cv.notify()
     
     def _handle_shutdown(self, signum, frame):
         print("\n[BOT] Shutting down...")
@@ -102,6 +147,7 @@ class BaseBot(ABC):
         self._last_prices[fill.symbol] = fill.fill_price
         self.portfolio.update(fill.symbol, fill.side, fill.fill_qty, fill.fill_price)
         self.on_fill(fill)
+        self._notify_tick()  # Only after the position reflects the fill
     
     def _internal_on_ack(self, ack):
         self.on_ack(ack)
@@ -145,9 +191,11 @@ class BaseBot(ABC):
     
     def update_price(self, symbol: str, price: float):
         self._last_prices[symbol] = price
+        self._notify_tick()
     
     def update_prices(self, prices: Dict[str, float]):
         self._last_prices.update(prices)
+        self._notify_tick()
     
     def get_pending_orders(self) -> dict:
         return self.client.get_pending_orders()
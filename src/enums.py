@@ -11,20 +11,15 @@ class Side(IntEnum):
     
     def as_string(self):
         """Convert to JSON format"""
-        if self == Side.BUY:
-            return "B"
-        else:
-            return "S"
+        return ("B", "S")[self.value - 1]
     
     @classmethod
     def parse(cls, code):
         """Parse from JSON format"""
-        if code in ("B", "Buy", "BUY", "bid", "BID"):
-            return cls.BUY
-        elif code in ("S", "SELL", "ASK"):
-            return cls.SELL
-        else:
-            raise ValueError(f"{code} is an Invalid Side")
+        try:
+            return _SIDE_CODES[code.upper()]
+        except KeyError:
+            raise ValueError(f"{code} is an Invalid Side") from None
 
 class OrdType(IntEnum):
     """Order type, Market or Limit"""
@@ -33,21 +28,15 @@ class OrdType(IntEnum):
     
     def as_string(self):
         """ Convert to JSON wire format """
-        if self == OrdType.MARKET:
-            return "MKT"
-        else:
-            return "LMT"
+        return ("MKT", "LMT")[self.value - 1]
     
     @classmethod
     def parse(cls, code):
         """Parse from JSON wire format"""
-        code = code.upper()
-        if code in ("MKT", "MARKET"):
-            return cls.MARKET
-        elif code in ("LMT", "LIMIT"):
-            return cls.LIMIT
-        else:
-            raise ValueError(f"{code} is an Invalid OrdType")
+        try:
+            return _ORD_TYPE_CODES[code.upper()]
+        except KeyError:
+            raise ValueError(f"{code.upper()} is an Invalid OrdType") from None
 
 
 class TimeInForce(IntEnum):
@@ -57,21 +46,23 @@ class TimeInForce(IntEnum):
     
     def as_string(self):
         """Convert to JSON format"""
-        if self == TimeInForce.DAY:
-            return "DAY"
-        else:
-            return "IOC"
+        return ("DAY", "IOC")[self.value - 1]
     
     @classmethod
     def parse(cls, code):
         """Parse from JSON format"""
-        code = code.upper()
-        if code == "DAY":
-            return cls.DAY
-        elif code == "IOC":
-            return cls.IOC
-        else:
-            raise ValueError(f"{code} is an Invalid TimeInForce")
+        try:
+            return _TIF_CODES[code.upper()]
+        except KeyError:
+            raise ValueError(f"{code.upper()} is an Invalid TimeInForce") from None
+
+
+# Accepted wire codes, matched after upper-casing
+_SIDE_CODES = {"B": Side.BUY, "BUY": Side.BUY, "BID": Side.BUY,
+               "S": Side.SELL, "SELL": Side.SELL, "ASK": Side.SELL}
+_ORD_TYPE_CODES = {"MKT": OrdType.MARKET, "MARKET": OrdType.MARKET,
+                   "LMT": OrdType.LIMIT, "LIMIT": OrdType.LIMIT}
+_TIF_CODES = {"DAY": TimeInForce.DAY, "IOC": TimeInForce.IOC}
 
 
 class MsgType(IntEnum):
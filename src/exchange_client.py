@@ -1,39 +1,81 @@
 """
 Network communication with the C++ exchange via ZeroMQ.
 """
+import logging
+import operator
 import threading
 import zmq
 
-from .enums import Side, OrdType, TimeInForce, MsgType
-from .messages import Envelope, Ack, Reject, Fill, create_new_order, create_cancel
+from ._msgbuf import get_buffer
+from .enums import Side, OrdType, TimeInForce
+from .messages import Envelope, Ack, Reject, Fill, create_cancel, compile_encoders, new_order_template
+
+logger = logging.getLogger(__name__)
+
+# Max messages drained per poll wakeup, so stop() is still noticed under load
+_DRAIN_LIMIT = 64
+
+
+def _pending_entry(body):
+    if not hasattr(body, 'client_order_id'):
+        return None
+    return body.client_order_id, {
+        "symbol": getattr(body, 'symbol', ''),
+        "side": getattr(body, 'side', None),
+        "qty": getattr(body, 'qty', 0)
+    }
 
 
 class ExchangeClient:
     """Client for communicating with the C++ exchange."""
     
-    def __init__(self, client_id, host="localhost", send_port=5555, recv_port=5556):
+    def __init__(self, client_id, host="localhost", send_port=5555, recv_port=5556,
+                 send_hwm=1000, send_buffer=-1, wire_format="json", context=None):
+        if wire_format not in ("json", "binary"):
+            raise ValueError(f"{wire_format} is an Invalid wire format")
         self.client_id = client_id
         self.host = host
         self.send_port = send_port
         self.recv_port = recv_port
-        self._context = None
+        self.send_hwm = send_hwm
+        self.send_buffer = send_buffer  # -1 keeps the OS default
+        self.wire_format = wire_format  # "json" matches the exchange default, "binary" uses the struct layouts
+        self._encode = Envelope.to_bytes if wire_format == "binary" else Envelope.to_json
+        self._decode = Envelope.from_bytes if wire_format == "binary" else Envelope.from_json
+        self._encode_limit = None  # Specialized binary encoders, built on connect()
+        self._encode_market = None
+        self._encode_cancel = None
+        self._tmpl_cache = {}  # (symbol, side, ord_type, tif) -> JSON new order template
+        self._context = context
+        self._owns_context = context is None  # A shared context is left for its owner to term()
         self._send_socket = None
         self._recv_socket = None
         self._running = False
         self._listener_thread = None
         self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._batch = threading.local()
         self._next_order_id = 1
         self._next_seq = 1
         self._pending_orders = {}
         self._order_id_map = {}
-        self._callbacks = {MsgType.ACK: [], MsgType.REJECT: [], MsgType.FILL: []}
+        self._order_id_reverse = {}  # exchange order_id -> client_order_id
+        # Tuples are rebuilt on subscribe so dispatch is a plain attribute read
+        self._ack_cbs = ()
+        self._reject_cbs = ()
+        self._fill_cbs = ()
     
     def connect(self):
-        self._context = zmq.Context()
+        if self._owns_context:
+            self._context = zmq.Context()
         self._send_socket = self._context.socket(zmq.PUSH)
+        self._send_socket.setsockopt(zmq.SNDHWM, self.send_hwm)
+        self._send_socket.setsockopt(zmq.SNDBUF, self.send_buffer)
         self._send_socket.connect(f"tcp://{self.host}:{self.send_port}")
         self._recv_socket = self._context.socket(zmq.PULL)
         self._recv_socket.connect(f"tcp://{self.host}:{self.recv_port}")
+        if self.wire_format == "binary":
+            self._encode_limit, self._encode_market, self._encode_cancel = compile_encoders(self.client_id)
     
     def disconnect(self):
         self.stop()
@@ -41,7 +83,7 @@ class ExchangeClient:
             self._send_socket.close()
         if self._recv_socket:
             self._recv_socket.close()
-        if self._context:
+        if self._context and self._owns_context:
             self._context.term()
     
     def start(self):
@@ -56,15 +98,66 @@ class ExchangeClient:
         if self._listener_thread:
             self._listener_thread.join(timeout=1.0)
     
+    def begin_batch(self):
+        """Hold orders sent from the calling thread until flush_batch()."""
+        self._batch.orders = []
+    
+    def flush_batch(self):
+        orders = getattr(self._batch, "orders", None)
+        self._batch.orders = None
+        if orders:
+            self._send(orders)
+    
     def send_order(self, envelope):
-        self._send_socket.send_string(envelope.to_json())
-        if hasattr(envelope.body, 'client_order_id'):
+        if self.wire_format == "binary" and getattr(self._batch, "orders", None) is None:
+            # Unbatched binary sends pack into this thread's scratch buffer; zmq copies
+            # the bytes out during send(), so the buffer is free again on return
+            buf, nbytes = envelope.to_buffer(get_buffer())
+            with memoryview(buf)[:nbytes] as view:
+                self._send(((view, _pending_entry(envelope.body)),))
+        else:
+            self._submit(self._encode(envelope), _pending_entry(envelope.body))
+    
+    def send_orders(self, envelopes):
+        self._send([(self._encode(envelope), _pending_entry(envelope.body)) for envelope in envelopes])
+    
+    def _submit(self, payload, pending):
+        batch = getattr(self._batch, "orders", None)
+        if batch is not None:
+            self._record_pending(pending)
+            batch.append((payload, None))
+        else:
+            self._send(((payload, pending),))
+    
+    def _submit_encoded(self, encoder, pending, *args):
+        batch = getattr(self._batch, "orders", None)
+        if batch is not None:
+            buf = bytearray(encoder.size)  # Queued payloads need a buffer of their own
+            encoder(buf, *args)
+            self._record_pending(pending)
+            batch.append((buf, None))
+        else:
+            buf = get_buffer()
+            nbytes = encoder(buf, *args)
+            with memoryview(buf)[:nbytes] as view:
+                self._send(((view, pending),))
+    
+    def _record_pending(self, pending):
+        # Queued orders show in get_pending_orders() right away, as they did before batching
+        if pending is not None:
             with self._lock:
-                self._pending_orders[envelope.body.client_order_id] = {
-                    "symbol": getattr(envelope.body, 'symbol', ''),
-                    "side": getattr(envelope.body, 'side', None),
-                    "qty": getattr(envelope.body, 'qty', 0)
-                }
+                self._pending_orders[pending[0]] = pending[1]
+    
+    def _send(self, orders):
+        # Each order stays its own ZMQ message; sending them back to back lets
+        # the I/O thread coalesce the burst into as few TCP writes as it can.
+        with self._send_lock:
+            for payload, _ in orders:
+                self._send_socket.send(payload)
+        with self._lock:
+            for _, pending in orders:
+                if pending is not None:
+                    self._pending_orders[pending[0]] = pending[1]
     
     def send_limit_order(self, symbol, side, qty, price, tif=TimeInForce.DAY):
         with self._lock:
@@ -72,8 +165,13 @@ class ExchangeClient:
             self._next_order_id += 1
             seq = self._next_seq
             self._next_seq += 1
-        envelope = create_new_order(self.client_id, client_order_id, symbol, side, qty, price, OrdType.LIMIT, tif, seq)
-        self.send_order(envelope)
+        if self._encode_limit is not None:
+            self._submit_encoded(self._encode_limit, (client_order_id, {"symbol": symbol, "side": side, "qty": qty}),
+                                 client_order_id, symbol, side, qty, price, tif, seq)
+        else:
+            template = self._new_order_template(symbol, side, OrdType.LIMIT, tif)
+            payload = template % (seq, client_order_id, operator.index(qty), operator.index(price))
+            self._submit(payload, (client_order_id, {"symbol": symbol, "side": side, "qty": qty}))
         return client_order_id
     
     def send_market_order(self, symbol, side, qty):
@@ -82,60 +180,87 @@ class ExchangeClient:
             self._next_order_id += 1
             seq = self._next_seq
             self._next_seq += 1
-        envelope = create_new_order(self.client_id, client_order_id, symbol, side, qty, 0, OrdType.MARKET, TimeInForce.DAY, seq)
-        self.send_order(envelope)
+        if self._encode_market is not None:
+            self._submit_encoded(self._encode_market, (client_order_id, {"symbol": symbol, "side": side, "qty": qty}),
+                                 client_order_id, symbol, side, qty, seq)
+        else:
+            template = self._new_order_template(symbol, side, OrdType.MARKET, TimeInForce.DAY)
+            payload = template % (seq, client_order_id, operator.index(qty), 0)
+            self._submit(payload, (client_order_id, {"symbol": symbol, "side": side, "qty": qty}))
         return client_order_id
     
+    def _new_order_template(self, symbol, side, ord_type, tif):
+        key = (symbol, side, ord_type, tif)
+        template = self._tmpl_cache.get(key)
+        if template is None:
+            template = self._tmpl_cache[key] = new_order_template(self.client_id, symbol, side, ord_type, tif)
+        return template
+    
     def cancel_order(self, symbol, client_order_id):
         with self._lock:
             order_id = self._order_id_map.get(client_order_id, 0)
             seq = self._next_seq
             self._next_seq += 1
-        envelope = create_cancel(self.client_id, symbol, order_id, client_order_id, seq)
-        self.send_order(envelope)
+        if self._encode_cancel is not None:
+            self._submit_encoded(self._encode_cancel, (client_order_id, {"symbol": symbol, "side": None, "qty": 0}),
+                                 symbol, order_id, client_order_id, seq)
+        else:
+            envelope = create_cancel(self.client_id, symbol, order_id, client_order_id, seq)
+            self.send_order(envelope)
     
     def _listen_loop(self):
+        sock = self._recv_socket
         while self._running:
             try:
-                if self._recv_socket.poll(timeout=100):
-                    self._handle_message(self._recv_socket.recv_string())
+                if not sock.poll(timeout=100):
+                    continue
+                frames = []
+                try:
+                    while len(frames) < _DRAIN_LIMIT:
+                        frames.append(sock.recv(flags=zmq.NOBLOCK, copy=False))
+                except zmq.Again:
+                    pass
+                # Both decoders read the frame buffer in place
+                for frame in frames:
+                    self._handle_message(frame.buffer)
             except Exception as e:
                 if self._running:
-                    print(f"[ERROR] Listener: {e}")
+                    logger.error("Listener: %s", e)
     
-    def _handle_message(self, json_string):
+    def _handle_message(self, payload):
         try:
-            envelope = Envelope.from_json(json_string)
-            if isinstance(envelope.body, Ack):
+            body = self._decode(payload).body
+            kind = type(body)
+            if kind is Fill:
+                if body.complete:
+                    with self._lock:
+                        cid = self._order_id_reverse.pop(body.order_id, None)
+                        if cid is not None:
+                            self._pending_orders.pop(cid, None)
+                for cb in self._fill_cbs:
+                    cb(body)
+            elif kind is Ack:
                 with self._lock:
-                    self._order_id_map[envelope.body.client_order_id] = envelope.body.order_id
-                for cb in self._callbacks[MsgType.ACK]:
-                    cb(envelope.body)
-            elif isinstance(envelope.body, Reject):
+                    self._order_id_map[body.client_order_id] = body.order_id
+                    self._order_id_reverse[body.order_id] = body.client_order_id
+                for cb in self._ack_cbs:
+                    cb(body)
+            elif kind is Reject:
                 with self._lock:
-                    self._pending_orders.pop(envelope.body.client_order_id, None)
-                for cb in self._callbacks[MsgType.REJECT]:
-                    cb(envelope.body)
-            elif isinstance(envelope.body, Fill):
-                if envelope.body.complete:
-                    with self._lock:
-                        for cid, oid in self._order_id_map.items():
-                            if oid == envelope.body.order_id:
-                                self._pending_orders.pop(cid, None)
-                                break
-                for cb in self._callbacks[MsgType.FILL]:
-                    cb(envelope.body)
+                    self._pending_orders.pop(body.client_order_id, None)
+                for cb in self._reject_cbs:
+                    cb(body)
         except Exception as e:
-            print(f"[ERROR] Parse: {e}")
+            logger.error("Parse: %s", e)
     
     def on_ack(self, callback):
-        self._callbacks[MsgType.ACK].append(callback)
+        self._ack_cbs = self._ack_cbs + (callback,)
     
     def on_reject(self, callback):
-        self._callbacks[MsgType.REJECT].append(callback)
+        self._reject_cbs = self._reject_cbs + (callback,)
     
     def on_fill(self, callback):
-        self._callbacks[MsgType.FILL].append(callback)
+        self._fill_cbs = self._fill_cbs + (callback,)
     
     def get_pending_orders(self):
         with self._lock:
@@ -1,29 +1,152 @@
 """
 Message structures matching the C++ exchange protocol 
-These dataclasses represent the JSON messages sent to/from the exchange.
+These dataclasses represent the JSON messages sent to/from the exchange,
+and can also be packed into a fixed-layout binary form.
+
+Symbols on decoded messages and new orders are interned with sys.intern, so
+the dict lookups keyed on them (positions, prices) hit on identity.
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Union, Any
 import json
+import operator
+import re
+import struct
+import sys
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder emits the same compact bytes
+    orjson = None
 
 from .enums import Side, OrdType, TimeInForce, MsgType
 
 
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+    
+    def _loads(data):
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+# Wire codes per enum member, so serializers skip the as_string() calls
+_SIDE_STR = {side: side.as_string() for side in Side}
+_ORD_TYPE_STR = {ord_type: ord_type.as_string() for ord_type in OrdType}
+_TIF_STR = {tif: tif.as_string() for tif in TimeInForce}
+
+# Inbound decode tables; calling the Enum class goes through its slower lookup machinery
+_MSGTYPE_BY_INT = {msg_type.value: msg_type for msg_type in MsgType}
+_SIDE_BY_STR = {"B": Side.BUY, "S": Side.SELL}
+_SIDE_BY_INT = {side.value: side for side in Side}
+
+
+def _msg_type(value):
+    msg_type = _MSGTYPE_BY_INT.get(value)
+    return msg_type if msg_type is not None else MsgType(value)  # MsgType() raises for unknown values
+
+
+def _side(value):
+    side = _SIDE_BY_STR.get(value) or _SIDE_BY_INT.get(value)
+    if side is not None:
+        return side
+    return Side.parse(value) if isinstance(value, str) else Side(value)
+
+
+# =============================================================================
+# Binary wire layouts (little-endian, compiled once at import)
+# =============================================================================
+
+_HEADER_STRUCT = struct.Struct("<BHII")         # version, type, seq, client_id
+_NEW_ORDER_STRUCT = struct.Struct("<Q8sBBIqB")  # client_order_id, symbol, side, ord_type, qty, limit_price, tif
+_CANCEL_STRUCT = struct.Struct("<8sQQ")         # symbol, order_id, client_order_id
+_ACK_STRUCT = struct.Struct("<QQ8s")            # client_order_id, order_id, symbol
+_REJECT_STRUCT = struct.Struct("<Q8siH")        # client_order_id, symbol, code, reason length (UTF-8 reason follows)
+_FILL_STRUCT = struct.Struct("<Q8sBIq?")        # order_id, symbol, side, fill_qty, fill_price, complete
+
+SYMBOL_SIZE = 8
+
+
+def _pack_symbol(symbol):
+    raw = symbol.encode()
+    if len(raw) > SYMBOL_SIZE:
+        raise ValueError(f"{symbol} is too long for the binary wire format")
+    return raw
+
+
+def _unpack_symbol(raw):
+    return sys.intern(raw.rstrip(b"\0").decode())
+
+
+def _intern_symbol(symbol):
+    # JSON may carry "symbol": null (or a non-string); pass those through as the baseline did
+    return sys.intern(symbol) if type(symbol) is str else symbol
+
+
+# =============================================================================
+# Generated JSON serializers
+# =============================================================================
+
+def fast_json(cls):
+    """
+    Class decorator that generates ``to_json_bytes()`` for a dataclass.
+    
+    The generated method fills one precompiled bytes template with the
+    field values, in field order, so no intermediate dict is built. Enum
+    fields with ``as_string()`` are written as their wire code, looked up
+    in a per-field table built here; other ints are written as numbers and
+    strs as JSON strings. The output matches ``_dumps(obj.to_dict())`` for
+    classes whose to_dict() writes every field. Int fields go through
+    operator.index(), so a float raises TypeError instead of being
+    truncated.
+    """
+    parts = []
+    args = []
+    namespace = {"_dumps": _dumps, "_index": operator.index}
+    for f in fields(cls):
+        if hasattr(f.type, "as_string"):
+            namespace[f"_{f.name}_codes"] = {member: member.as_string().encode() for member in f.type}
+            parts.append(b'"%b":"%%b"' % f.name.encode())
+            args.append(f"_{f.name}_codes[self.{f.name}]")
+        elif issubclass(f.type, int) and f.type is not bool:
+            parts.append(b'"%b":%%d' % f.name.encode())
+            args.append(f"_index(self.{f.name})")  # %d would silently truncate a float
+        elif f.type is str:
+            parts.append(b'"%b":%%b' % f.name.encode())
+            args.append(f"_dumps(self.{f.name})")
+        else:
+            raise TypeError(f"fast_json cannot serialize {cls.__name__}.{f.name}: {f.type!r}")
+    
+    namespace["_TEMPLATE"] = b"{" + b",".join(parts) + b"}"
+    source = f"def to_json_bytes(self):\n    return _TEMPLATE % ({', '.join(args)},)\n"
+    exec(compile(source, f"<{cls.__name__}.to_json_bytes>", "exec"), namespace)
+    method = namespace["to_json_bytes"]
+    method.__qualname__ = f"{cls.__name__}.to_json_bytes"
+    cls.to_json_bytes = method
+    return cls
+
+
 # =============================================================================
 # Message Header (common to all messages)
 # =============================================================================
 
-@dataclass
+@fast_json
+@dataclass(slots=True)
 class MessageHeader:
+    type: MsgType
     version: int = 1
-    type: MsgType 
     seq: int = 0 
     client_id: int = 0
     
     def to_dict(self):
         return {
+            "type": self.type.value,  # JSON doesn't understand enums, convert to plain integer
             "version": self.version,
-            "type": int(self.type),  # JSON doesn't understand enums, convert to plain integer
             "seq": self.seq,
             "client_id": self.client_id
         }
@@ -32,17 +155,30 @@ class MessageHeader:
     def from_dict(cls, data):
         return cls(
             version=data.get("version", 1),
-            type=MsgType(data["type"]),
+            type=_msg_type(data["type"]),
             seq=data.get("seq", 0),
             client_id=data.get("client_id", 0)
         )
+    
+    def to_bytes(self):
+        return _HEADER_STRUCT.pack(self.version, self.type, self.seq, self.client_id)
+    
+    def pack_into(self, buf, offset=0):
+        _HEADER_STRUCT.pack_into(buf, offset, self.version, self.type, self.seq, self.client_id)
+        return offset + _HEADER_STRUCT.size
+    
+    @classmethod
+    def from_bytes(cls, buf):
+        version, msg_type, seq, client_id = _HEADER_STRUCT.unpack_from(buf)
+        return cls(type=_msg_type(msg_type), version=version, seq=seq, client_id=client_id)
 
 
 # =============================================================================
 # Bot -> Exchange
 # =============================================================================
 
-@dataclass
+@fast_json
+@dataclass(slots=True)
 class NewOrderRequest:
     """ Request to place a new order """
 
@@ -58,16 +194,41 @@ class NewOrderRequest:
         result = {
             "client_order_id": self.client_order_id,
             "symbol": self.symbol,
-            "side": self.side.as_string(),
-            "ord_type": self.ord_type.as_string(),
+            "side": _SIDE_STR[self.side],
+            "ord_type": _ORD_TYPE_STR[self.ord_type],
             "qty": self.qty,
             "limit_price": self.limit_price,
-            "tif": self.tif.as_string()
+            "tif": _TIF_STR[self.tif]
         }
+        return result
+    
+    def to_bytes(self):
+        return _NEW_ORDER_STRUCT.pack(self.client_order_id, _pack_symbol(self.symbol), self.side,
+                                      self.ord_type, self.qty, self.limit_price, self.tif)
+    
+    def pack_into(self, buf, offset=0):
+        _NEW_ORDER_STRUCT.pack_into(buf, offset, self.client_order_id, _pack_symbol(self.symbol), self.side,
+                                    self.ord_type, self.qty, self.limit_price, self.tif)
+        return offset + _NEW_ORDER_STRUCT.size
+    
+    @classmethod
+    def from_bytes(cls, buf, offset=0):
+        client_order_id, symbol, side, ord_type, qty, limit_price, tif = _NEW_ORDER_STRUCT.unpack_from(buf, offset)
+        return cls(client_order_id=client_order_id, symbol=_unpack_symbol(symbol), side=_side(side),
+                   ord_type=OrdType(ord_type), qty=qty, limit_price=limit_price, tif=TimeInForce(tif))
     
 
 
-@dataclass
+# Cancel JSON per combination of ids present, indexed by (order_id set) << 1 | (client_order_id set)
+_CANCEL_ENCODERS = (
+    lambda c: b'{"symbol":%b}' % (_dumps(c.symbol),),
+    lambda c: b'{"client_order_id":%d,"symbol":%b}' % (c.client_order_id, _dumps(c.symbol)),
+    lambda c: b'{"order_id":%d,"symbol":%b}' % (c.order_id, _dumps(c.symbol)),
+    lambda c: b'{"order_id":%d,"client_order_id":%d,"symbol":%b}' % (c.order_id, c.client_order_id, _dumps(c.symbol)),
+)
+
+
+@dataclass(slots=True)
 class CancelRequest:
     """ Request to cancel an existing order """
 
@@ -81,10 +242,24 @@ class CancelRequest:
             result["order_id"] = self.order_id
         if self.client_order_id != 0:
             result["client_order_id"] = self.client_order_id
-        if self.symbol:
-            result["symbol"] = self.symbol
+        result["symbol"] = self.symbol
         return result
     
+    def to_json_bytes(self):
+        return _CANCEL_ENCODERS[(self.order_id != 0) << 1 | (self.client_order_id != 0)](self)
+    
+    def to_bytes(self):
+        return _CANCEL_STRUCT.pack(_pack_symbol(self.symbol), self.order_id, self.client_order_id)
+    
+    def pack_into(self, buf, offset=0):
+        _CANCEL_STRUCT.pack_into(buf, offset, _pack_symbol(self.symbol), self.order_id, self.client_order_id)
+        return offset + _CANCEL_STRUCT.size
+    
+    @classmethod
+    def from_bytes(cls, buf, offset=0):
+        symbol, order_id, client_order_id = _CANCEL_STRUCT.unpack_from(buf, offset)
+        return cls(symbol=_unpack_symbol(symbol), order_id=order_id, client_order_id=client_order_id)
+    
 
 # =============================================================================
 # Outbound Messages (Exchange -> Bot)
@@ -107,7 +282,7 @@ class RejectInfo:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class Ack:
     """ Order acknowledgment """
 
@@ -122,33 +297,49 @@ class Ack:
         return cls(
             client_order_id=data.get("client_order_id", 0),
             order_id=data.get("order_id", 0),
-            symbol=data.get("symbol", "")
+            symbol=_intern_symbol(data.get("symbol", ""))
         )
+    
+    @classmethod
+    def from_bytes(cls, buf, offset=0):
+        client_order_id, order_id, symbol = _ACK_STRUCT.unpack_from(buf, offset)
+        return cls(client_order_id=client_order_id, order_id=order_id, symbol=_unpack_symbol(symbol))
+    
+    def to_bytes(self):
+        return _ACK_STRUCT.pack(self.client_order_id, self.order_id, _pack_symbol(self.symbol))
 
 
-@dataclass
+@dataclass(slots=True)
 class Reject:
     """ Order rejection, sent by exchange when order is rejected. """
 
     client_order_id: int = 0
     symbol: str = ""
-    info: RejectInfo = None
-    
-    def __post_init__(self):
-        if self.info is None:
-            self.info = RejectInfo()
+    info: RejectInfo = field(default_factory=RejectInfo)
     
     @classmethod
     def from_dict(cls, data):
+        client_order_id = data.get("client_order_id", 0)
+        symbol = _intern_symbol(data.get("symbol", ""))
         info_data = data.get("info")
-        return cls(
-            client_order_id=data.get("client_order_id", 0),
-            symbol=data.get("symbol", ""),
-            info=RejectInfo.from_dict(info_data) if info_data else RejectInfo()
-        )
+        if info_data:
+            return cls(client_order_id=client_order_id, symbol=symbol, info=RejectInfo.from_dict(info_data))
+        return cls(client_order_id=client_order_id, symbol=symbol)
+    
+    @classmethod
+    def from_bytes(cls, buf, offset=0):
+        client_order_id, symbol, code, reason_len = _REJECT_STRUCT.unpack_from(buf, offset)
+        start = offset + _REJECT_STRUCT.size
+        reason = bytes(buf[start:start + reason_len]).decode()
+        return cls(client_order_id=client_order_id, symbol=_unpack_symbol(symbol),
+                   info=RejectInfo(reason=reason, code=code))
+    
+    def to_bytes(self):
+        reason = self.info.reason.encode()
+        return _REJECT_STRUCT.pack(self.client_order_id, _pack_symbol(self.symbol), self.info.code, len(reason)) + reason
 
 
-@dataclass
+@dataclass(slots=True)
 class Fill:
     """
     Order fill notification, sent by exchange when order is (partially or fully) filled.
@@ -162,20 +353,24 @@ class Fill:
     
     @classmethod
     def from_dict(cls, data):
-        side_value = data.get("side", "B")
-        if isinstance(side_value, str):
-            side = Side.parse(side_value)
-        else:
-            side = Side(side_value)
-
         return cls(
             order_id=data.get("order_id", 0),
-            symbol=data.get("symbol", ""),
-            side=side,
+            symbol=_intern_symbol(data.get("symbol", "")),
+            side=_side(data.get("side", "B")),
             fill_qty=data.get("fill_qty", 0),
             fill_price=data.get("fill_price", 0),
             complete=data.get("complete", False)
         )
+    
+    @classmethod
+    def from_bytes(cls, buf, offset=0):
+        order_id, symbol, side, fill_qty, fill_price, complete = _FILL_STRUCT.unpack_from(buf, offset)
+        return cls(order_id=order_id, symbol=_unpack_symbol(symbol), side=_side(side),
+                   fill_qty=fill_qty, fill_price=fill_price, complete=complete)
+    
+    def to_bytes(self):
+        return _FILL_STRUCT.pack(self.order_id, _pack_symbol(self.symbol), self.side,
+                                 self.fill_qty, self.fill_price, self.complete)
 
 
 # =============================================================================
@@ -185,6 +380,17 @@ class Fill:
 # Type alias for inbound/outbound message bodies
 MessageBody = Union[NewOrderRequest, CancelRequest, Ack, Reject, Fill, dict]
 
+# Body parsers per message type. The binary layout is symmetric, so outbound
+# types decode too (for loopback exchanges, recorders and replay).
+_BODY_PARSERS = {MsgType.ACK: Ack.from_dict, MsgType.REJECT: Reject.from_dict, MsgType.FILL: Fill.from_dict}
+_BINARY_BODY_PARSERS = {
+    MsgType.NEW_ORDER: NewOrderRequest.from_bytes,
+    MsgType.CANCEL: CancelRequest.from_bytes,
+    MsgType.ACK: Ack.from_bytes,
+    MsgType.REJECT: Reject.from_bytes,
+    MsgType.FILL: Fill.from_bytes,
+}
+
 
 @dataclass
 class Envelope:
@@ -194,29 +400,53 @@ class Envelope:
     body: MessageBody
     
     def to_json(self):
-        """Serialize to JSON string for sending over ZMQ"""
-        body_dict = self.body.to_dict() if hasattr(self.body, 'to_dict') else self.body
-        return json.dumps({
-            "header": self.header.to_dict(),
-            "body": body_dict
-        })
+        """Serialize to compact UTF-8 JSON bytes for sending over ZMQ"""
+        body = self.body
+        if hasattr(body, 'to_json_bytes'):
+            body_json = body.to_json_bytes()
+        else:
+            body_json = _dumps(body.to_dict() if hasattr(body, 'to_dict') else body)
+        return b'{"header":%b,"body":%b}' % (self.header.to_json_bytes(), body_json)
     
     @classmethod
-    def from_json(cls, json_string):
-        """Create from JSON string received from exchange."""
-        data = json.loads(json_string)
+    def from_json(cls, json_data):
+        """Create from JSON (str, bytes or memoryview) received from exchange."""
+        data = _loads(json_data)
         header = MessageHeader.from_dict(data["header"])
         body_data = data["body"]
         
-        # Parse body based on message type
-        if header.type == MsgType.ACK:
-            body = Ack.from_dict(body_data)
-        elif header.type == MsgType.REJECT:
-            body = Reject.from_dict(body_data)
-        elif header.type == MsgType.FILL:
-            body = Fill.from_dict(body_data)
-        else:
-            body = body_data  # Unknown type, keep as dictionary
+        # Parse body based on message type; unknown types stay a dictionary
+        parser = _BODY_PARSERS.get(header.type)
+        body = parser(body_data) if parser else body_data
+        
+        return cls(header=header, body=body)
+    
+    def to_bytes(self):
+        """Serialize to the fixed binary layout for sending over ZMQ"""
+        if not hasattr(self.body, 'to_bytes'):
+            raise TypeError(f"{type(self.body).__name__} has no binary encoding")
+        return self.header.to_bytes() + self.body.to_bytes()
+    
+    def to_buffer(self, buf):
+        """
+        Pack the binary layout into the start of a reusable buffer.
+        
+        Returns:
+            (buf, nbytes); send memoryview(buf)[:nbytes] before reusing buf
+        """
+        if not hasattr(self.body, 'pack_into'):
+            raise TypeError(f"{type(self.body).__name__} has no binary encoding")
+        return buf, self.body.pack_into(buf, self.header.pack_into(buf))
+    
+    @classmethod
+    def from_bytes(cls, buf):
+        """Create from a binary message (exchange replies, or orders on a loopback)."""
+        header = MessageHeader.from_bytes(buf)
+        offset = _HEADER_STRUCT.size
+        
+        # Unknown types keep the raw payload
+        parser = _BINARY_BODY_PARSERS.get(header.type)
+        body = parser(buf, offset) if parser else bytes(buf[offset:])
         
         return cls(header=header, body=body)
 
@@ -251,7 +481,7 @@ def create_new_order(client_id, client_order_id, symbol, side, qty,
     )
     body = NewOrderRequest(
         client_order_id=client_order_id,
-        symbol=symbol,
+        symbol=_intern_symbol(symbol),
         side=side,
         ord_type=ord_type,
         qty=qty,
@@ -261,6 +491,48 @@ def create_new_order(client_id, client_order_id, symbol, side, qty,
     return Envelope(header=header, body=body)
 
 
+# Stand-ins for the per-order fields (seq, client_order_id, qty, limit_price) when rendering a template
+_TEMPLATE_SENTINELS = (2**62 + 1, 2**62 + 2, 2**62 + 3, 2**62 + 4)
+_JSON_INT_RE = re.compile(rb":(\d+)(?=[,}])")
+
+
+def new_order_template(client_id, symbol, side, ord_type, tif):
+    """
+    Build a JSON template for new orders that share one shape.
+    
+    The template is rendered by Envelope.to_json() on a create_new_order()
+    envelope, with the per-order fields swapped for placeholders, so it
+    always matches the regular serializer. Fill it with
+    ``template % (seq, client_order_id, qty, limit_price)``.
+    
+    Args:
+        client_id: Bot's ID
+        symbol: Stock symbol (e.g., "AAPL")
+        side: Side.BUY or Side.SELL
+        ord_type: OrdType.LIMIT or OrdType.MARKET
+        tif: TimeInForce.DAY or TimeInForce.IOC
+    
+    Returns:
+        bytes template with four %d placeholders
+    """
+    seq, client_order_id, qty, limit_price = _TEMPLATE_SENTINELS
+    rendered = create_new_order(client_id, client_order_id, symbol, side, qty, limit_price,
+                                ord_type, tif, seq).to_json().replace(b"%", b"%%")
+    found = []
+    
+    def placeholder(match):
+        value = int(match.group(1))
+        if value not in _TEMPLATE_SENTINELS:
+            return match.group(0)
+        found.append(value)
+        return b":%d"
+    
+    template = _JSON_INT_RE.sub(placeholder, rendered)
+    if tuple(found) != _TEMPLATE_SENTINELS:
+        raise ValueError("new order JSON no longer lists seq, client_order_id, qty, limit_price in that order")
+    return template
+
+
 def create_cancel(client_id, symbol, order_id=0, client_order_id=0, seq=0):
     """
     Convenience function to create a cancel request envelope.
@@ -286,3 +558,66 @@ def create_cancel(client_id, symbol, order_id=0, client_order_id=0, seq=0):
         client_order_id=client_order_id
     )
     return Envelope(header=header, body=body)
+
+
+# =============================================================================
+# Specialized binary encoders
+# =============================================================================
+
+# Whole-message layouts (header + body) for the specialized encoders
+_NEW_ORDER_MSG_STRUCT = struct.Struct(_HEADER_STRUCT.format + _NEW_ORDER_STRUCT.format[1:])
+_CANCEL_MSG_STRUCT = struct.Struct(_HEADER_STRUCT.format + _CANCEL_STRUCT.format[1:])
+
+# Each template packs header and body into buf in one call, with everything
+# fixed for the message shape (version, type, client_id, ord_type, ...) baked in.
+_ENCODER_TEMPLATES = (
+    ("encode_limit", _NEW_ORDER_MSG_STRUCT,
+     "def encode_limit(buf, client_order_id, symbol, side, qty, price, tif, seq):\n"
+     "    _pack_into(buf, 0, {version}, {new_order}, seq, {client_id}, client_order_id, _pack_symbol(symbol), "
+     "side, {limit}, qty, price, tif)\n"
+     "    return {size}\n"),
+    ("encode_market", _NEW_ORDER_MSG_STRUCT,
+     "def encode_market(buf, client_order_id, symbol, side, qty, seq):\n"
+     "    _pack_into(buf, 0, {version}, {new_order}, seq, {client_id}, client_order_id, _pack_symbol(symbol), "
+     "side, {market}, qty, 0, {day})\n"
+     "    return {size}\n"),
+    ("encode_cancel", _CANCEL_MSG_STRUCT,
+     "def encode_cancel(buf, symbol, order_id, client_order_id, seq):\n"
+     "    _pack_into(buf, 0, {version}, {cancel}, seq, {client_id}, _pack_symbol(symbol), order_id, client_order_id)\n"
+     "    return {size}\n"),
+)
+
+
+def compile_encoders(client_id):
+    """
+    Generate straight-line binary encoders for one client.
+    
+    Each encoder takes a writable buffer first, packs the message into its
+    start and returns the byte count, which is also exposed as the
+    encoder's ``size`` attribute. The bytes written are exactly what
+    Envelope.to_bytes() produces for the same limit, market and cancel
+    messages.
+    
+    Args:
+        client_id: Bot's ID, baked into every header
+    
+    Returns:
+        (encode_limit, encode_market, encode_cancel)
+    """
+    constants = {
+        "version": 1,
+        "client_id": int(client_id),
+        "new_order": int(MsgType.NEW_ORDER),
+        "cancel": int(MsgType.CANCEL),
+        "limit": int(OrdType.LIMIT),
+        "market": int(OrdType.MARKET),
+        "day": int(TimeInForce.DAY),
+    }
+    encoders = []
+    for name, layout, template in _ENCODER_TEMPLATES:
+        namespace = {"_pack_into": layout.pack_into, "_pack_symbol": _pack_symbol}
+        exec(compile(template.format(size=layout.size, **constants), f"<{name}>", "exec"), namespace)
+        encoder = namespace[name]
+        encoder.size = layout.size
+        encoders.append(encoder)
+    return tuple(encoders)
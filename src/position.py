@@ -2,8 +2,9 @@
 Position and P&L tracking for trading bots.
 """
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Deque, Dict, List, Optional, Tuple
 
 from .enums import Side
 
@@ -16,7 +17,7 @@ class Trade:
     qty: int
     price: float
     realized_pnl: float = 0.0
-    timestamp: float = field(default_factory=time.time)
+    timestamp: int = field(default_factory=time.monotonic_ns)  # Monotonic clock, nanoseconds
 
 
 @dataclass
@@ -68,23 +69,28 @@ class Position:
 class Portfolio:
     """Tracks all positions and overall P&L for a bot."""
     
-    def __init__(self):
+    def __init__(self, max_trades: Optional[int] = 10000):
         self._positions: Dict[str, Position] = {}
-        self._trades: List[Trade] = []
+        # Most recent trades as plain tuples; Trade objects are only built by get_trades().
+        # max_trades=None keeps the full history.
+        self._trades: Deque[Tuple[str, Side, int, float, float, int]] = deque(maxlen=max_trades)
     
     def get_position(self, symbol):
-        if symbol not in self._positions:
-            self._positions[symbol] = Position(symbol=symbol)
-        return self._positions[symbol]
+        # Fill symbols arrive interned (see messages), so lookups usually hit on identity
+        position = self._positions.get(symbol)
+        if position is None:
+            position = self._positions[symbol] = Position(symbol=symbol)
+        return position
     
     def update(self, symbol, side, fill_qty, fill_price):
         position = self.get_position(symbol)
         realized = position.update(side, fill_qty, fill_price)
-        self._trades.append(Trade(symbol=symbol, side=side, qty=fill_qty, price=fill_price, realized_pnl=realized))
+        self._trades.append((symbol, side, fill_qty, fill_price, realized, time.monotonic_ns()))
         return realized
     
     def get_quantity(self, symbol):
-        return self._positions[symbol].quantity if symbol in self._positions else 0
+        position = self._positions.get(symbol)
+        return position.quantity if position is not None else 0
     
     def get_all_positions(self):
         return dict(self._positions)
@@ -96,26 +102,35 @@ class Portfolio:
         return sum(p.realized_pnl for p in self._positions.values())
     
     def total_unrealized_pnl(self, prices):
-        return sum(p.unrealized_pnl(prices[s]) for s, p in self._positions.items() if p.quantity != 0 and s in prices)
+        # quantity * (price - avg_cost) is the unrealized P&L of both longs and shorts
+        total = 0.0
+        for symbol, position in self._positions.items():
+            quantity = position.quantity
+            if quantity:
+                price = prices.get(symbol)
+                if price is not None:
+                    total += quantity * (price - position.avg_cost)
+        return total
     
     def total_pnl(self, prices):
         return self.total_realized_pnl() + self.total_unrealized_pnl(prices)
     
-    def get_trades(self):
-        return list(self._trades)
+    def get_trades(self) -> List[Trade]:
+        return [Trade(*trade) for trade in self._trades]
     
     def summary(self, prices=None):
         lines = ["=" * 60, "PORTFOLIO SUMMARY", "=" * 60]
         active = self.get_active_positions()
         if active:
             lines.extend(["", "POSITIONS:", "-" * 60, f"{'Symbol':<10} {'Qty':>10} {'Avg Cost':>12} {'Realized':>12}", "-" * 60])
-            for s, p in active.items():
+            for p in active.values():
                 lines.append(f"{p.symbol:<10} {p.quantity:>10} {p.avg_cost:>12.2f} {p.realized_pnl:>12.2f}")
         else:
             lines.extend(["", "NO ACTIVE POSITIONS"])
-        lines.extend(["", "-" * 60, f"{'Realized P&L:':<30} ${self.total_realized_pnl():>12.2f}"])
+        realized = self.total_realized_pnl()
+        lines.extend(["", "-" * 60, f"{'Realized P&L:':<30} ${realized:>12.2f}"])
         if prices:
             unrealized = self.total_unrealized_pnl(prices)
-            lines.extend([f"{'Unrealized P&L:':<30} ${unrealized:>12.2f}", f"{'Total P&L:':<30} ${self.total_realized_pnl() + unrealized:>12.2f}"])
+            lines.extend([f"{'Unrealized P&L:':<30} ${unrealized:>12.2f}", f"{'Total P&L:':<30} ${realized + unrealized:>12.2f}"])
         lines.append("=" * 60)
         return "\n".join(lines)